@@ -19,7 +19,8 @@ from scrapers.website_intelligence import (
     CommunityWebsiteScraper,
     CommunityKnowledge,
     ExtractedContent,
-    scrape_community_website
+    scrape_community_website,
+    scrape_community_websites
 )
 
 __all__ = [
@@ -35,6 +36,7 @@ __all__ = [
     'CommunityWebsiteScraper',
     'CommunityKnowledge',
     'ExtractedContent',
-    'scrape_community_website'
+    'scrape_community_website',
+    'scrape_community_websites'
 ]
 
@@ -28,6 +28,14 @@ logger = logging.getLogger(__name__)
 ACTOR_ID = "epctex~apartments-scraper"
 APIFY_API_BASE = "https://api.apify.com/v2"
 
+# Patterns used per floor plan model (compiled once at import)
+_RE_BUILT_IN = re.compile(r'Built in (\d{4})')
+_RE_UNITS_COUNT = re.compile(r'(\d+)\s*units?', re.IGNORECASE)
+_RE_AVAILABLE = re.compile(r'(\d+)\s*(?:Available|available)')
+_RE_BEDROOMS = re.compile(r'(\d+)\s*(?:bed|bd|br|bedroom)')
+_RE_BATHROOMS = re.compile(r'(\d+(?:\.\d+)?)\s*(?:bath|ba)')
+_RE_NUMBER = re.compile(r'[\d,]+')
+
 # State abbreviation mapping (full name -> abbreviation)
 STATE_ABBREV = {
     'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
@@ -539,13 +547,13 @@ class ApifyApartmentsScraper:
                     
                     # Parse "Built in 1936"
                     if not year_built:
-                        year_match = re.search(r'Built in (\d{4})', key)
+                        year_match = _RE_BUILT_IN.search(key)
                         if year_match:
                             year_built = int(year_match.group(1))
                     
                     # Parse "16 units/2 stories" or "100 units"
                     if not units_count:
-                        units_match = re.search(r'(\d+)\s*units?', key, re.IGNORECASE)
+                        units_match = _RE_UNITS_COUNT.search(key)
                         if units_match:
                             units_count = int(units_match.group(1))
         
@@ -622,7 +630,7 @@ class ApifyApartmentsScraper:
             # Also check availability string
             if not available_count:
                 avail_str = model.get("availability", "")
-                avail_match = re.search(r'(\d+)\s*(?:Available|available)', avail_str)
+                avail_match = _RE_AVAILABLE.search(avail_str)
                 if avail_match:
                     available_count = int(avail_match.group(1))
             
@@ -651,7 +659,7 @@ class ApifyApartmentsScraper:
             return 0
         
         # Match patterns like "1 bed", "2 bd", "3 br", "4 bedroom"
-        match = re.search(r'(\d+)\s*(?:bed|bd|br|bedroom)', name_lower)
+        match = _RE_BEDROOMS.search(name_lower)
         if match:
             return int(match.group(1))
         
@@ -660,13 +668,13 @@ class ApifyApartmentsScraper:
     def _parse_bathrooms(self, model_name: str, details: List[str]) -> float:
         """Parse bathroom count from model name or details"""
         # Try model name first: "1 Bed/1 Bath", "2 Bed/2.5 Bath"
-        match = re.search(r'(\d+(?:\.\d+)?)\s*(?:bath|ba)', model_name.lower())
+        match = _RE_BATHROOMS.search(model_name.lower())
         if match:
             return float(match.group(1))
         
         # Try details array: ["1 bed", "1 bath", "500 sq ft"]
         for detail in details:
-            match = re.search(r'(\d+(?:\.\d+)?)\s*(?:bath|ba)', detail.lower())
+            match = _RE_BATHROOMS.search(detail.lower())
             if match:
                 return float(match.group(1))
         
@@ -680,7 +688,7 @@ class ApifyApartmentsScraper:
             return None, None
         
         # Remove currency symbols and find all numbers
-        numbers = re.findall(r'[\d,]+', rent_label)
+        numbers = _RE_NUMBER.findall(rent_label)
         numbers = [int(n.replace(',', '')) for n in numbers if n.replace(',', '').isdigit()]
         
         if len(numbers) >= 2:
@@ -695,7 +703,7 @@ class ApifyApartmentsScraper:
         for detail in details:
             detail_lower = detail.lower()
             if 'sq ft' in detail_lower or 'sqft' in detail_lower:
-                numbers = re.findall(r'[\d,]+', detail)
+                numbers = _RE_NUMBER.findall(detail)
                 numbers = [int(n.replace(',', '')) for n in numbers if n.replace(',', '').isdigit()]
                 
                 if len(numbers) >= 2:
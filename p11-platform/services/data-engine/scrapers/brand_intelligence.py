@@ -4,6 +4,7 @@ Scrapes competitor websites and extracts AI-powered brand insights
 """
 
 import os
+import re
 import json
 import asyncio
 import hashlib
@@ -26,6 +27,9 @@ from utils.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# "[Source: amenities page]" marker that CommunityWebsiteScraper puts on each chunk
+_RE_CHUNK_SOURCE = re.compile(r'\[Source:\s*(\w+)\s*page\]')
+
 
 class JobStatus(str, Enum):
     PENDING = "pending"
@@ -254,8 +258,7 @@ class BrandIntelligenceExtractor:
             page_type = "general"
             if chunk.startswith("[Source:"):
                 # Extract page type from context marker
-                import re
-                match = re.match(r'\[Source:\s*(\w+)\s*page\]', chunk)
+                match = _RE_CHUNK_SOURCE.match(chunk)
                 if match:
                     page_type = match.group(1)
             
@@ -619,32 +622,34 @@ class CompetitorBatchProcessor:
         processed = 0
         failed = 0
         
-        for i, competitor in enumerate(competitors_with_urls):
-            try:
-                async with self._semaphore:
-                    success = await self._process_single_competitor(
-                        competitor,
-                        force_refresh
-                    )
-                
-                if success:
-                    processed += 1
-                    self._update_job_progress(job_id, processed, failed, competitor['id'], None)
-                else:
-                    failed += 1
-                    self._update_job_progress(job_id, processed, failed, None, competitor['id'])
-                
-                # Rate limiting between competitors
-                if i < len(competitors_with_urls) - 1:
-                    await asyncio.sleep(self.DELAY_BETWEEN_COMPETITORS)
+        # Keep one browser up for the whole job; each site still gets its own context
+        async with self.extractor.scraper:
+            for i, competitor in enumerate(competitors_with_urls):
+                try:
+                    async with self._semaphore:
+                        success = await self._process_single_competitor(
+                            competitor,
+                            force_refresh
+                        )
                     
-            except Exception as e:
-                logger.error(f"Error processing competitor {competitor['id']}: {e}")
-                failed += 1
-                self._update_job_progress(
-                    job_id, processed, failed, None, competitor['id'],
-                    {'competitor_id': competitor['id'], 'error': str(e)}
-                )
+                    if success:
+                        processed += 1
+                        self._update_job_progress(job_id, processed, failed, competitor['id'], None)
+                    else:
+                        failed += 1
+                        self._update_job_progress(job_id, processed, failed, None, competitor['id'])
+                    
+                    # Rate limiting between competitors
+                    if i < len(competitors_with_urls) - 1:
+                        await asyncio.sleep(self.DELAY_BETWEEN_COMPETITORS)
+                        
+                except Exception as e:
+                    logger.error(f"Error processing competitor {competitor['id']}: {e}")
+                    failed += 1
+                    self._update_job_progress(
+                        job_id, processed, failed, None, competitor['id'],
+                        {'competitor_id': competitor['id'], 'error': str(e)}
+                    )
         
         # Complete job
         self._complete_job(job_id, processed, failed)
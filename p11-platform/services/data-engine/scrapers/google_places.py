@@ -8,7 +8,7 @@ Updated Dec 2025: Added review extraction capabilities
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -686,8 +686,129 @@ except ImportError:
     logger.warning("Playwright not available for Google Maps scraping")
 
 import re
+import html
+import json
 import hashlib
+import tempfile
 import concurrent.futures
+import requests
+
+PROGRESS_LOG_EVERY = 25  # Reviews between progress log lines
+
+_STAR_RE = re.compile(r'(\d+)')
+_REVIEWS_LABEL_RE = re.compile(r'reviews', re.I)
+
+# Internal endpoint the Maps frontend uses to page through a place's reviews.
+# Responses are JSON prefixed with an XSSI guard line.
+GMAPS_REVIEWS_ENDPOINT = 'https://www.google.com/maps/preview/review/listentitiesreviews'
+GMAPS_REVIEWS_PAGE_SIZE = 10
+_FEATURE_ID_RE = re.compile(r'(0x[0-9a-f]{6,}):(0x[0-9a-f]{6,})')
+# <meta>/<link> tags in any attribute order; the place page's own canonical URL
+# carries its feature ID (".../data=!...!1s0x..:0x..")
+_HEAD_TAG_RE = re.compile(r'<(?:meta|link)\b[^>]*>', re.I)
+_TAG_ATTR_RE = re.compile(r'([\w:-]+)="([^"]*)"')
+_TITLE_RE = re.compile(r'<title>([^<]*)</title>', re.I)
+# How far from the place ID a feature ID may sit and still count as the same data block
+_FEATURE_ID_WINDOW = 2000
+_XSSI_PREFIX = ")]}'"
+_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+def _page_meta(page_text: str) -> Dict[str, str]:
+    """Map og:/itemprop/name keys and rel="canonical" to their URL or content"""
+    meta: Dict[str, str] = {}
+    for tag in _HEAD_TAG_RE.finditer(page_text):
+        attrs = dict(_TAG_ATTR_RE.findall(tag.group(0)))
+        key = attrs.get('property') or attrs.get('itemprop') or attrs.get('name') or attrs.get('rel')
+        value = attrs.get('content') or attrs.get('href')
+        if key and value:
+            meta.setdefault(key, html.unescape(value))
+    return meta
+
+
+def _find_feature_id(page_text: str, meta: Dict[str, str], place_id: str) -> Optional[Tuple[int, int]]:
+    """
+    Feature ID (the two halves of "0x..:0x..") of the place a Maps place page is
+    about. Place pages also embed IDs of nearby/related places, so only an ID in
+    the page's own canonical URL, or the one nearest the requested place ID in
+    the page data, is trusted; otherwise None.
+    """
+    match = None
+    for key in ('canonical', 'og:url', 'url'):
+        match = _FEATURE_ID_RE.search(meta.get(key, ''))
+        if match:
+            break
+    
+    if not match:
+        anchor = page_text.find(place_id)
+        if anchor < 0:
+            return None
+        candidates = list(_FEATURE_ID_RE.finditer(
+            page_text, max(0, anchor - _FEATURE_ID_WINDOW), anchor + _FEATURE_ID_WINDOW
+        ))
+        if not candidates:
+            return None
+        match = min(candidates, key=lambda m: abs(m.start() - anchor))
+    
+    return int(match.group(1), 16), int(match.group(2), 16)
+
+
+def _parse_place_name(page_text: str, meta: Dict[str, str]) -> Optional[str]:
+    """Place name from a Maps place page's og:title ("Name · Address") or <title>"""
+    if meta.get('og:title'):
+        name = meta['og:title'].split(' · ')[0].strip()
+    else:
+        title = _TITLE_RE.search(page_text)
+        name = html.unescape(title.group(1)).removesuffix(' - Google Maps').strip() if title else ''
+    return name if name and name != 'Google Maps' else None
+
+
+GMAPS_STORAGE_STATE_PATH = '~/.cache/gmaps_reviews/state.json'
+_CONSENT_BUTTON_SELECTOR = 'button[aria-label*="Accept"], button[aria-label*="Reject"]'
+
+_REVIEW_ELEMENT_SELECTOR = '[data-review-id], div.jftiEf, div.jJc9Ad'
+
+# Runs inside the page: scrolls the reviews feed and waits (up to pauseMs) for a
+# MutationObserver to report new reviews, resolving once maxReviews distinct review
+# IDs have rendered or that count has not grown for maxStale consecutive scrolls.
+# One card holds several [data-review-id] nodes, so IDs are counted, not nodes.
+_SCROLL_REVIEWS_JS = """
+async ({maxReviews, pauseMs, maxStale}) => {
+    const feed = document.querySelector('div[role="feed"]')
+        || document.querySelector('.m6QErb.DxyBCb.kA9KIf.dS8AEf')
+        || document.querySelector('.m6QErb')
+        || document.scrollingElement;
+    const countReviews = () => new Set(
+        Array.from(document.querySelectorAll('[data-review-id]'), e => e.getAttribute('data-review-id'))
+    ).size;
+    let lastCount = countReviews();
+    let stale = 0;
+    let wake = null;
+    const obs = new MutationObserver(() => {
+        if (wake && countReviews() > lastCount) wake();
+    });
+    obs.observe(feed, {childList: true, subtree: true});
+    try {
+        while (lastCount < maxReviews && stale < maxStale) {
+            feed.scrollTop = feed.scrollHeight;
+            await new Promise(resolve => {
+                const timer = setTimeout(resolve, pauseMs);
+                wake = () => { clearTimeout(timer); resolve(); };
+            });
+            wake = null;
+            const n = countReviews();
+            stale = n > lastCount ? 0 : stale + 1;
+            lastCount = n;
+        }
+    } finally {
+        obs.disconnect();
+    }
+    return lastCount;
+}
+"""
 
 
 class GoogleMapsReviewScraper:
@@ -699,16 +820,54 @@ class GoogleMapsReviewScraper:
     reviews panel.
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, storage_state_path: Optional[str] = None):
         self.headless = headless
+        # Cookies saved after the Google consent interstitial is dismissed, reused on later runs
+        self.storage_state_path = os.path.expanduser(
+            storage_state_path or os.environ.get('GMAPS_STORAGE_STATE_PATH', GMAPS_STORAGE_STATE_PATH)
+        )
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError("Playwright required. Install: pip install playwright && playwright install chromium")
     
+    def _dismiss_consent(self, page) -> bool:
+        """Click through Google's cookie-consent interstitial if it is shown"""
+        try:
+            consent_button = page.query_selector(_CONSENT_BUTTON_SELECTOR)
+            if not consent_button:
+                return False
+            consent_button.click()
+            page.wait_for_load_state('domcontentloaded', timeout=15000)
+            logger.info("[Playwright] Dismissed Google consent dialog")
+            return True
+        except Exception as e:
+            logger.debug(f"[Playwright] Could not dismiss consent dialog: {e}")
+            return False
+    
+    def _save_storage_state(self, context) -> None:
+        """Persist cookies/localStorage so later runs skip the consent redirect"""
+        # Scrapes run in executor threads that share this file: write a private temp
+        # file and rename it into place so readers never see a half-written state
+        state_dir = os.path.dirname(self.storage_state_path)
+        tmp_path = None
+        try:
+            os.makedirs(state_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix='.tmp')
+            os.close(fd)
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, self.storage_state_path)
+            tmp_path = None
+            logger.info(f"[Playwright] Saved browser state to {self.storage_state_path}")
+        except Exception as e:
+            logger.warning(f"[Playwright] Could not save browser state: {e}")
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
     def _scrape_reviews_sync(
         self, 
         place_id: str, 
         max_reviews: int = 100,
-        scroll_pause: float = 1.5
+        scroll_pause: float = 0.8
     ) -> Dict[str, Any]:
         """
         Scrape reviews from Google Maps for a given Place ID (synchronous)
@@ -716,7 +875,7 @@ class GoogleMapsReviewScraper:
         Args:
             place_id: Google Place ID (e.g., ChIJN1t_tDeuEmsRUsoyG83frY4)
             max_reviews: Maximum number of reviews to fetch
-            scroll_pause: Seconds to wait between scrolls
+            scroll_pause: Max seconds to wait for new reviews after each scroll
             
         Returns:
             Dict with reviews and metadata
@@ -726,15 +885,19 @@ class GoogleMapsReviewScraper:
         
         reviews = []
         place_name = None
+        # One timestamp for the whole batch: the page does not expose review dates
+        scrape_ts = datetime.utcnow().isoformat()
         
         logger.info(f"[Playwright] Scraping Google Maps reviews for place: {place_id}")
         
         try:
             with sync_playwright() as p:
                 browser = p.chromium.launch(headless=self.headless)
+                has_saved_state = os.path.exists(self.storage_state_path)
                 context = browser.new_context(
                     viewport={'width': 1280, 'height': 900},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    storage_state=self.storage_state_path if has_saved_state else None
                 )
                 page = context.new_page()
                 
@@ -742,13 +905,16 @@ class GoogleMapsReviewScraper:
                 logger.info(f"[Playwright] Navigating to: {url}")
                 page.goto(url, wait_until='domcontentloaded', timeout=60000)
                 
-                # Wait for the page to actually load content
-                logger.info("[Playwright] Waiting for page content...")
-                page.wait_for_timeout(5000)
+                # First run (or expired cookies) lands on the consent page; accept it and
+                # save the resulting state so subsequent runs go straight to Maps.
+                # Only rewrite the file when the dialog was actually dismissed.
+                if self._dismiss_consent(page):
+                    self._save_storage_state(context)
                 
-                # Try to wait for reviews section to appear
+                # Wait for the reviews section to appear (bounded selector wait, no fixed sleep)
+                logger.info("[Playwright] Waiting for page content...")
                 try:
-                    page.wait_for_selector('div[role="feed"], .jftiEf, [data-review-id]', timeout=15000)
+                    page.wait_for_selector('div[role="feed"], [data-review-id]', timeout=15000, state='attached')
                     logger.info("[Playwright] Reviews section found!")
                 except:
                     logger.warning("[Playwright] Reviews section not found immediately, continuing...")
@@ -765,85 +931,55 @@ class GoogleMapsReviewScraper:
                 try:
                     logger.info("[Playwright] Looking for reviews button...")
                     
-                    # Try multiple selectors for the reviews tab
-                    selectors_to_try = [
-                        'button[aria-label*="Reviews"]',
-                        'button[aria-label*="reviews"]', 
-                        'button[data-tab-index="1"]',
-                        '[role="tab"]:has-text("Reviews")',
-                        'button:has-text("reviews")',
-                        '.Gpq6kf.fontTitleSmall:has-text("Reviews")',  # Reviews tab text
-                    ]
-                    
-                    reviews_button = None
-                    for selector in selectors_to_try:
-                        try:
-                            reviews_button = page.query_selector(selector)
-                            if reviews_button:
-                                logger.info(f"[Playwright] Found reviews button with: {selector}")
-                                break
-                        except:
-                            continue
+                    # One lazily-resolved locator covering the tab and button variants
+                    reviews_button = page.get_by_role("tab", name=_REVIEWS_LABEL_RE).or_(
+                        page.get_by_role("button", name=_REVIEWS_LABEL_RE)
+                    ).first
                     
-                    if reviews_button:
-                        reviews_button.click()
+                    if reviews_button.count() > 0:
+                        reviews_button.click(timeout=3000)
                         logger.info("[Playwright] Clicked reviews button, waiting for reviews to load...")
-                        page.wait_for_timeout(3000)
+                        try:
+                            page.wait_for_selector('[data-review-id]', timeout=5000)
+                        except PlaywrightTimeout:
+                            logger.warning("[Playwright] Reviews did not render after click, continuing...")
                     else:
                         logger.warning("[Playwright] Could not find reviews button, trying to find reviews directly")
                 except Exception as e:
                     logger.warning(f"Could not click reviews button: {e}")
                 
-                # Find the scrollable reviews container
-                logger.info("[Playwright] Looking for scrollable reviews container...")
-                scroll_container = page.query_selector('div[role="feed"]')
-                if not scroll_container:
-                    scroll_container = page.query_selector('.m6QErb.DxyBCb.kA9KIf.dS8AEf')
-                if not scroll_container:
-                    scroll_container = page.query_selector('.m6QErb')
+                # Scroll the reviews panel inside the page until enough reviews have
+                # rendered or the list stops growing, then extract everything once
+                logger.info("[Playwright] Scrolling reviews panel...")
+                rendered = page.evaluate(_SCROLL_REVIEWS_JS, {
+                    'maxReviews': max_reviews,
+                    'pauseMs': int(scroll_pause * 1000),
+                    'maxStale': 5,
+                })
+                logger.debug(f"[Playwright] {rendered} distinct reviews rendered")
                 
-                if scroll_container:
-                    logger.info("[Playwright] Found scroll container")
-                else:
-                    logger.warning("[Playwright] No scroll container found, will use page scroll")
-                
-                # Scroll and collect reviews
-                last_count = 0
-                no_new_reviews_count = 0
-                
-                while len(reviews) < max_reviews and no_new_reviews_count < 5:
-                    # Get all review elements - try multiple selectors
-                    review_elements = page.query_selector_all('[data-review-id], div.jftiEf, div.jJc9Ad')
-                    logger.info(f"[Playwright] Found {len(review_elements)} review elements on page")
-                    
-                    for review_el in review_elements:
-                        try:
-                            review_data = self._extract_review_data_sync(review_el, place_id)
-                            if review_data and review_data['platform_review_id'] not in [r['platform_review_id'] for r in reviews]:
-                                reviews.append(review_data)
-                                
-                                if len(reviews) >= max_reviews:
-                                    break
-                        except Exception as e:
+                seen_ids = set()
+                last_milestone = 0
+                review_elements = page.query_selector_all(_REVIEW_ELEMENT_SELECTOR)
+                for review_el in review_elements:
+                    try:
+                        review_data = self._extract_review_data_sync(review_el, place_id, scrape_ts)
+                        if review_data and review_data['platform_review_id'] not in seen_ids:
+                            seen_ids.add(review_data['platform_review_id'])
+                            reviews.append(review_data)
+                            
+                            if len(reviews) >= max_reviews:
+                                break
+                            
+                            if len(reviews) // PROGRESS_LOG_EVERY > last_milestone:
+                                last_milestone = len(reviews) // PROGRESS_LOG_EVERY
+                                logger.info(f"[Playwright] {len(reviews)} reviews...")
+                    except Exception as e:
+                        if logger.isEnabledFor(logging.DEBUG):
                             logger.debug(f"Error extracting review: {e}")
-                            continue
-                    
-                    # Check if we got new reviews
-                    if len(reviews) == last_count:
-                        no_new_reviews_count += 1
-                    else:
-                        no_new_reviews_count = 0
-                    last_count = len(reviews)
-                    
-                    # Scroll down
-                    if scroll_container:
-                        scroll_container.evaluate('el => el.scrollTop = el.scrollHeight')
-                    else:
-                        page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                    
-                    page.wait_for_timeout(int(scroll_pause * 1000))
-                    
-                    logger.info(f"[Playwright] Collected {len(reviews)} reviews so far...")
+                        continue
+                
+                logger.info(f"[Playwright] Collected {len(reviews)} reviews")
                 
                 browser.close()
                 
@@ -862,7 +998,7 @@ class GoogleMapsReviewScraper:
             'note': f'Scraped {len(reviews)} reviews via Google Maps web interface'
         }
     
-    def _extract_review_data_sync(self, review_el, place_id: str) -> Optional[Dict[str, Any]]:
+    def _extract_review_data_sync(self, review_el, place_id: str, scrape_ts: str) -> Optional[Dict[str, Any]]:
         """Extract review data from a review element (synchronous)"""
         try:
             # Try to get review ID from data attribute
@@ -882,7 +1018,7 @@ class GoogleMapsReviewScraper:
             if stars_container:
                 aria_label = stars_container.get_attribute('aria-label')
                 if aria_label:
-                    match = re.search(r'(\d+)', aria_label)
+                    match = _STAR_RE.search(aria_label)
                     if match:
                         rating = int(match.group(1))
             
@@ -908,7 +1044,7 @@ class GoogleMapsReviewScraper:
             # Generate unique ID if not found
             if not review_id:
                 unique_str = f"{place_id}-{reviewer_name}-{review_text[:50]}"
-                review_id = f"google-{hashlib.md5(unique_str.encode()).hexdigest()[:12]}"
+                review_id = f"google-{hashlib.blake2b(unique_str.encode('utf-8'), digest_size=6).hexdigest()}"
             
             return {
                 'platform_review_id': review_id,
@@ -916,7 +1052,7 @@ class GoogleMapsReviewScraper:
                 'reviewer_avatar_url': avatar_url,
                 'rating': rating,
                 'review_text': review_text,
-                'review_date': datetime.utcnow().isoformat(),
+                'review_date': scrape_ts,
                 'relative_time': relative_time,
                 'platform': 'google'
             }
@@ -924,6 +1060,123 @@ class GoogleMapsReviewScraper:
             logger.debug(f"Error extracting review data: {e}")
             return None
     
+    def _try_http_scrape(self, place_id: str, max_reviews: int = 100) -> Optional[Dict[str, Any]]:
+        """
+        Fetch reviews from the Maps reviews JSON endpoint without launching a browser.
+        
+        Resolves the place's feature ID from the Maps place page, then pages
+        through listentitiesreviews. Returns None on any HTTP error or
+        unexpected payload so the caller can fall back to Playwright.
+        """
+        scrape_ts = datetime.utcnow().isoformat()
+        try:
+            with requests.Session() as session:
+                session.headers.update(_HTTP_HEADERS)
+                
+                place_page = session.get(
+                    'https://www.google.com/maps/place/',
+                    params={'q': f'place_id:{place_id}'},
+                    timeout=15
+                )
+                place_page.raise_for_status()
+                page_meta = _page_meta(place_page.text)
+                feature_id = _find_feature_id(place_page.text, page_meta, place_id)
+                if not feature_id:
+                    logger.info("[HTTP] Could not resolve Maps feature ID, falling back to Playwright")
+                    return None
+                feature_hi, feature_lo = feature_id
+                place_name = _parse_place_name(place_page.text, page_meta)
+                
+                reviews = []
+                seen_ids = set()
+                offset = 0
+                while len(reviews) < max_reviews:
+                    pb = (
+                        f"!1m2!1y{feature_hi}!2y{feature_lo}"
+                        f"!2m2!1i{offset}!2i{GMAPS_REVIEWS_PAGE_SIZE}"
+                        "!3e1!4m5!4b1!5b1!6b1!7b1!5m2!1s!7e81"
+                    )
+                    response = session.get(
+                        GMAPS_REVIEWS_ENDPOINT,
+                        params={'authuser': '0', 'hl': 'en', 'gl': 'us', 'pb': pb},
+                        timeout=15
+                    )
+                    response.raise_for_status()
+                    
+                    body = response.text
+                    if body.startswith(_XSSI_PREFIX):
+                        body = body[len(_XSSI_PREFIX):]
+                    payload = json.loads(body)
+                    
+                    page_reviews = payload[2] if len(payload) > 2 else None
+                    if not page_reviews:
+                        break
+                    
+                    for raw in page_reviews:
+                        review_data = self._parse_http_review(raw, place_id, scrape_ts)
+                        if review_data and review_data['platform_review_id'] not in seen_ids:
+                            seen_ids.add(review_data['platform_review_id'])
+                            reviews.append(review_data)
+                            if len(reviews) >= max_reviews:
+                                break
+                    
+                    if len(page_reviews) < GMAPS_REVIEWS_PAGE_SIZE:
+                        break
+                    offset += GMAPS_REVIEWS_PAGE_SIZE
+        except (requests.RequestException, ValueError, TypeError, IndexError) as e:
+            logger.info(f"[HTTP] Reviews endpoint unavailable ({e}), falling back to Playwright")
+            return None
+        
+        if not reviews:
+            return None
+        
+        logger.info(f"[HTTP] Fetched {len(reviews)} reviews without a browser")
+        return {
+            'success': True,
+            'place_id': place_id,
+            'place_name': place_name,
+            'reviews': reviews,
+            'reviews_fetched': len(reviews),
+            'method': 'maps_http_endpoint',
+            'note': f'Fetched {len(reviews)} reviews via Google Maps reviews endpoint'
+        }
+    
+    def _parse_http_review(self, raw: List[Any], place_id: str, scrape_ts: str) -> Optional[Dict[str, Any]]:
+        """Parse one positional review array from the listentitiesreviews payload"""
+        try:
+            author = raw[0] or []
+            reviewer_name = (author[1] if len(author) > 1 else None) or 'Anonymous'
+            avatar_url = author[2] if len(author) > 2 else None
+            relative_time = raw[1]
+            review_text = raw[3] or ''
+            rating = int(raw[4] or 0)
+            review_id = raw[10] if len(raw) > 10 else None
+            
+            if not review_id:
+                unique_str = f"{place_id}-{reviewer_name}-{review_text[:50]}"
+                review_id = f"google-{hashlib.blake2b(unique_str.encode('utf-8'), digest_size=6).hexdigest()}"
+            
+            return {
+                'platform_review_id': review_id,
+                'reviewer_name': reviewer_name,
+                'reviewer_avatar_url': avatar_url,
+                'rating': rating,
+                'review_text': review_text,
+                'review_date': scrape_ts,
+                'relative_time': relative_time,
+                'platform': 'google'
+            }
+        except (IndexError, TypeError, ValueError) as e:
+            logger.debug(f"Error parsing endpoint review: {e}")
+            return None
+    
+    def _scrape_reviews(self, place_id: str, max_reviews: int = 100) -> Dict[str, Any]:
+        """Try the browserless HTTP endpoint first, then fall back to Playwright"""
+        result = self._try_http_scrape(place_id, max_reviews)
+        if result:
+            return result
+        return self._scrape_reviews_sync(place_id, max_reviews)
+    
     async def scrape_reviews_async(self, place_id: str, max_reviews: int = 100) -> Dict[str, Any]:
         """
         Async wrapper that runs Playwright in a thread pool to avoid Windows asyncio issues
@@ -940,15 +1193,15 @@ class GoogleMapsReviewScraper:
             if loop:
                 result = await loop.run_in_executor(
                     executor,
-                    self._scrape_reviews_sync,
+                    self._scrape_reviews,
                     place_id,
                     max_reviews
                 )
             else:
-                result = executor.submit(self._scrape_reviews_sync, place_id, max_reviews).result()
+                result = executor.submit(self._scrape_reviews, place_id, max_reviews).result()
         
         return result
     
     def scrape_reviews(self, place_id: str, max_reviews: int = 100) -> Dict[str, Any]:
         """Synchronous entry point"""
-        return self._scrape_reviews_sync(place_id, max_reviews)
+        return self._scrape_reviews(place_id, max_reviews)
@@ -9,15 +9,56 @@ Documentation: https://serpapi.com/google-maps-reviews-api
 """
 
 import os
+import json
+import hashlib
+import time
+import asyncio
 import logging
+import httpx
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 SERPAPI_BASE_URL = "https://serpapi.com/search.json"
+SERPAPI_PAGE_SIZE = 20  # Reviews returned per SerpAPI page
+PROGRESS_LOG_EVERY = 100  # Reviews between progress log lines
+SERPAPI_CACHE_TTL_SECONDS = 6 * 60 * 60  # Review pages change slowly; reuse for 6h
+SERPAPI_CACHE_MAX_ENTRIES = 512
+
+# In-process page cache: (place_id, sort_by, page token/offset) -> (expires_at, response JSON)
+_page_cache: Dict[Tuple[str, str, Union[str, int, None]], Tuple[float, Dict[str, Any]]] = {}
+
+
+def _cache_get(key: Tuple[str, str, Union[str, int, None]]) -> Optional[Dict[str, Any]]:
+    """Return a cached SerpAPI page if present and not expired"""
+    entry = _page_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if expires_at < time.monotonic():
+        _page_cache.pop(key, None)
+        return None
+    return data
+
+
+def _cache_set(key: Tuple[str, str, Union[str, int, None]], data: Dict[str, Any]) -> None:
+    """Cache a successful SerpAPI page, evicting the oldest entry when full"""
+    if "error" in data:
+        return
+    if len(_page_cache) >= SERPAPI_CACHE_MAX_ENTRIES:
+        _page_cache.pop(next(iter(_page_cache)), None)
+    _page_cache[key] = (time.monotonic() + SERPAPI_CACHE_TTL_SECONDS, data)
 
 
 @dataclass
@@ -59,6 +100,19 @@ class SerpApiReviewsScraper:
         self.api_key = api_key or os.environ.get('SERPAPI_API_KEY')
         if not self.api_key:
             raise ValueError("SerpAPI key required. Set SERPAPI_API_KEY env var.")
+        
+        # Pooled keep-alive session so paginated requests reuse one TLS connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        )
+        self._session.mount("https://", adapter)
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self._session.close()
     
     def get_reviews(
         self, 
@@ -80,31 +134,29 @@ class SerpApiReviewsScraper:
         reviews = []
         next_page_token = None
         place_info = {}
+        last_milestone = 0
+        scrape_ts = datetime.utcnow().isoformat()
         
         logger.info(f"[SerpAPI] Fetching reviews for place: {place_id}")
         
         try:
             while len(reviews) < max_reviews:
-                # Build request params
-                params = {
-                    "engine": "google_maps_reviews",
-                    "place_id": place_id,
-                    "api_key": self.api_key,
-                    "hl": "en",  # Language
-                    "sort_by": sort_by,
-                }
-                
-                if next_page_token:
-                    params["next_page_token"] = next_page_token
-                
-                # Make request
-                response = requests.get(SERPAPI_BASE_URL, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+                cache_key = (place_id, sort_by, next_page_token)
+                data = _cache_get(cache_key)
+                if data is None:
+                    params = self._build_params(place_id, sort_by, next_page_token=next_page_token)
+                    
+                    # Make request
+                    response = self._session.get(SERPAPI_BASE_URL, params=params, timeout=30)
+                    response.raise_for_status()
+                    data = _json_loads(response.content)
+                    _cache_set(cache_key, data)
                 
                 # Check for errors
                 if "error" in data:
                     logger.error(f"[SerpAPI] Error: {data['error']}")
+                    if reviews:
+                        return self._build_result(place_id, place_info, reviews, error=data['error'])
                     break
                 
                 # Extract place info (first page only)
@@ -118,15 +170,17 @@ class SerpApiReviewsScraper:
                     logger.info("[SerpAPI] No more reviews found")
                     break
                 
-                for review_data in page_reviews:
-                    if len(reviews) >= max_reviews:
-                        break
-                    
-                    review = self._parse_review(review_data, place_id)
-                    if review:
-                        reviews.append(review)
+                remaining = page_reviews[:max_reviews - len(reviews)]
+                reviews.extend(filter(None, map(
+                    lambda review_data: self._parse_review(review_data, place_id, scrape_ts),
+                    remaining
+                )))
                 
-                logger.info(f"[SerpAPI] Fetched {len(reviews)} reviews so far...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[SerpAPI] Fetched {len(reviews)} reviews so far...")
+                if len(reviews) // PROGRESS_LOG_EVERY > last_milestone:
+                    last_milestone = len(reviews) // PROGRESS_LOG_EVERY
+                    logger.info(f"[SerpAPI] {len(reviews)} reviews...")
                 
                 # Check for next page
                 next_page_token = data.get("serpapi_pagination", {}).get("next_page_token")
@@ -149,7 +203,145 @@ class SerpApiReviewsScraper:
                 'reviews': [r.to_dict() for r in reviews]
             }
         
-        return {
+        return self._build_result(place_id, place_info, reviews)
+    
+    async def get_reviews_async(
+        self,
+        place_id: str,
+        max_reviews: int = 100,
+        sort_by: str = "newestFirst"
+    ) -> Dict[str, Any]:
+        """
+        Async version of get_reviews, for callers already on an event loop.
+        
+        SerpAPI's first reviews page is shorter than the rest and each later
+        page is only reachable through the previous page's next_page_token, so
+        pages are fetched in order; concurrency comes from running several
+        places at once. Reviews are deduped by review ID.
+        
+        Args:
+            place_id: Google Place ID
+            max_reviews: Maximum number of reviews to fetch
+            sort_by: Sort order (see get_reviews)
+            
+        Returns:
+            Dict with reviews and metadata (same shape as get_reviews). If a
+            page fails after some reviews were collected, 'partial' is True and
+            'error' says why.
+        """
+        reviews: List[SerpApiReview] = []
+        seen_ids = set()
+        next_page_token = None
+        place_info: Dict[str, Any] = {}
+        pages_fetched = 0
+        scrape_ts = datetime.utcnow().isoformat()
+        
+        logger.info(f"[SerpAPI] Fetching reviews (async) for place: {place_id}")
+        
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                while len(reviews) < max_reviews:
+                    data = await self._fetch_page_async(client, place_id, sort_by, next_page_token)
+                    
+                    if "error" in data:
+                        logger.error(f"[SerpAPI] Error: {data['error']}")
+                        if reviews:
+                            return self._build_result(place_id, place_info, reviews, error=data['error'])
+                        break
+                    pages_fetched += 1
+                    
+                    if not place_info and "place_info" in data:
+                        place_info = data["place_info"]
+                    
+                    page_reviews = data.get("reviews", [])
+                    if not page_reviews:
+                        break
+                    
+                    for review_data in page_reviews:
+                        if len(reviews) >= max_reviews:
+                            break
+                        review = self._parse_review(review_data, place_id, scrape_ts)
+                        if review and review.platform_review_id not in seen_ids:
+                            seen_ids.add(review.platform_review_id)
+                            reviews.append(review)
+                    
+                    next_page_token = data.get("serpapi_pagination", {}).get("next_page_token")
+                    if not next_page_token:
+                        break
+            
+            logger.info(f"[SerpAPI] Fetched {len(reviews)} reviews from {pages_fetched} pages")
+        
+        except httpx.HTTPError as e:
+            logger.error(f"[SerpAPI] Request error: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'reviews': [r.to_dict() for r in reviews]
+            }
+        except Exception as e:
+            logger.error(f"[SerpAPI] Error: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'reviews': [r.to_dict() for r in reviews]
+            }
+        
+        return self._build_result(place_id, place_info, reviews)
+    
+    async def _fetch_page_async(
+        self,
+        client: httpx.AsyncClient,
+        place_id: str,
+        sort_by: str,
+        next_page_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch a single reviews page (shares the page cache with get_reviews)"""
+        cache_key = (place_id, sort_by, next_page_token)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        params = self._build_params(place_id, sort_by, next_page_token=next_page_token)
+        response = await client.get(SERPAPI_BASE_URL, params=params)
+        response.raise_for_status()
+        data = _json_loads(response.content)
+        _cache_set(cache_key, data)
+        return data
+    
+    def _build_params(
+        self,
+        place_id: str,
+        sort_by: str,
+        next_page_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build SerpAPI request params for one reviews page"""
+        params = {
+            "engine": "google_maps_reviews",
+            "place_id": place_id,
+            "api_key": self.api_key,
+            "hl": "en",  # Language
+            "sort_by": sort_by,
+        }
+        
+        if next_page_token:
+            params["next_page_token"] = next_page_token
+        
+        return params
+    
+    def _build_result(
+        self,
+        place_id: str,
+        place_info: Dict[str, Any],
+        reviews: List[SerpApiReview],
+        error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the success payload returned by get_reviews / get_reviews_async.
+        
+        Pass error when pagination stopped early on a failed page: the reviews
+        collected so far are still returned, flagged as partial.
+        """
+        result = {
             'success': True,
             'place_id': place_id,
             'place_name': place_info.get('title'),
@@ -161,12 +353,20 @@ class SerpApiReviewsScraper:
             'method': 'serpapi',
             'note': f'Retrieved {len(reviews)} reviews via SerpAPI'
         }
+        if error:
+            result['partial'] = True
+            result['error'] = error
+            result['note'] += f' (stopped early: {error})'
+        return result
     
-    def _parse_review(self, data: Dict[str, Any], place_id: str) -> Optional[SerpApiReview]:
+    def _parse_review(self, data: Dict[str, Any], place_id: str, scrape_ts: Optional[str] = None) -> Optional[SerpApiReview]:
         """Parse a review from SerpAPI response"""
         try:
-            # Generate unique ID
-            review_id = data.get('review_id') or f"serp-{place_id}-{hash(str(data))}"
+            # Generate unique ID (stable across runs, unlike built-in hash())
+            review_id = data.get('review_id')
+            if not review_id:
+                unique_str = f"{place_id}-{(data.get('user') or {}).get('name', '')}-{(data.get('snippet') or '')[:50]}-{data.get('iso_date') or data.get('date', '')}"
+                review_id = f"serp-{place_id}-{hashlib.blake2b(unique_str.encode('utf-8'), digest_size=6).hexdigest()}"
             
             # Get user info
             user = data.get('user', {})
@@ -182,7 +382,7 @@ class SerpApiReviewsScraper:
             # Get date
             review_date = data.get('iso_date') or data.get('date', '')
             if not review_date:
-                review_date = datetime.utcnow().isoformat()
+                review_date = scrape_ts or datetime.utcnow().isoformat()
             
             relative_time = data.get('date')  # e.g., "2 weeks ago"
             